@@ -8,10 +8,32 @@ from antminer.exceptions import (
 )
 from antminer.constants import (
     STATUS_INFO, STATUS_SUCCESS, DEFAULT_PORT, MINER_CGMINER,
-    MINER_BMMINER
+    MINER_BMMINER, MINER_UNKNWON
 )
 from antminer.utils import parse_version_number
 
+try:
+    import orjson
+except ImportError:  # optional speed-up; stdlib json is used otherwise
+    orjson = None
+
+if orjson is not None:
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+else:
+    _loads = json.loads
+
+    def _dumps(obj):
+        # Compact like orjson; ensure_ascii (the default) makes ASCII safe
+        return json.dumps(obj, separators=(',', ':')).encode('ascii')
+
+# Initial receive buffer; grown in the same steps for larger replies.
+RECV_BUFSIZE = 65536
+# Kernel receive buffer, large enough to take a whole `stats` reply at once.
+SO_RCVBUF_SIZE = 262144
+# Prevents hangs on misbehaving firmware.
+SOCKET_TIMEOUT = 5.0
+
 
 class Core(object):
     def __init__(self, host, port=DEFAULT_PORT, mac_addr=None):
@@ -21,17 +43,37 @@ class Core(object):
         self.mac_addr = mac_addr 
 
     def connect(self):
-        self.conn = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.conn.connect((self.host, self.port))
+        # Configured by attach() before connect(), so the larger receive
+        # window is offered in the SYN and the connect itself is bounded.
+        self.attach(socket.socket(socket.AF_INET, socket.SOCK_STREAM))
+        try:
+            self.conn.connect((self.host, self.port))
+        except OSError:
+            self.close()
+            raise
+
+    def attach(self, sock):
+        """
+        Configure sock and use it as the connection: a fresh one from
+        connect(), or one already connected, e.g. left over from discovery.
+        """
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SO_RCVBUF_SIZE)
+        sock.settimeout(SOCKET_TIMEOUT)
+        self.conn = sock
 
     def close(self):
-        self.conn.close()
-        self.conn = None
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
 
-    def send_command(self, command):
-        if self.conn is None:
-            self.connect()
+    def __enter__(self):
+        return self
 
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def send_command(self, command):
         cmd = command.split('|')
         if len(cmd) > 2 or len(cmd) == 0:
             raise ValueError("Commands must be one or two parts")
@@ -43,49 +85,84 @@ class Core(object):
         if len(cmd) == 2:
             payload['parameter'] = cmd[1]
 
-        # self.conn.send(json.dumps(payload))
-        self.conn.sendall(json.dumps(payload).encode('utf-8'))
-        payload = self.read_response()
+        data = _dumps(payload)
+
+        # The connection is kept open between commands; call close() (or use
+        # the client as a context manager) once done with the miner.
+        reused = self.conn is not None
+        if not reused:
+            self.connect()
+        try:
+            self.conn.sendall(data)
+        except (ConnectionResetError, BrokenPipeError):
+            if not reused:
+                raise
+            # The command never got through the dead socket; safe to resend.
+            retry = True
+        else:
+            try:
+                payload, timed_out = self._read_reply()
+            except ConnectionResetError:
+                self.close()
+                if not reused:
+                    raise
+                payload, timed_out = '', False
+            # EOF/reset before any reply byte: the miner had dropped the
+            # kept-alive socket while we were idle. A timeout is never
+            # retried: a slow miner may already be running the command, and
+            # addpool/restart/... must not run twice.
+            retry = reused and not payload and not timed_out
+
+        if retry:
+            self.close()
+            self.connect()
+            self.conn.sendall(data)
+            payload = self.read_response()
+
         try:
-            response = json.loads(payload)
+            response = _loads(payload)
         except ValueError:
             response = payload# Assume downstream code knows what to do.
 
-        self.close()
         return response
 
-    # def read_response(self):
-    #     final_result = ""
-    #     done = False
-    #     buf = self.conn.recv(4096)
-    #     while done is False:
-    #         more = self.conn.recv(4096)
-    #         if not more:
-    #             done = True
-    #         else:
-    #             buf += more
-    #     return buf.replace('\x00','')
     def read_response(self):
-        # Optional: prevent hangs on misbehaving firmware
-        try:
-            self.conn.settimeout(5.0)
-        except Exception:
-            pass
-
-        chunks = []
+        return self._read_reply()[0]
+
+    def _read_reply(self):
+        """Read one reply -> (text, timed_out)."""
+        buf = bytearray(RECV_BUFSIZE)
+        view = memoryview(buf)
+        off = 0
+        timed_out = False
         while True:
+            if off == len(buf):
+                # Large `stats` reply; grow in place (the view pins the size)
+                view.release()
+                buf.extend(bytes(RECV_BUFSIZE))
+                view = memoryview(buf)
             try:
-                chunk = self.conn.recv(4096)
+                n = self.conn.recv_into(view[off:])
             except socket.timeout:
-                # Timed out waiting for more data; use what we have
+                # Timed out waiting for more data; use what we have. The rest
+                # of the reply may still arrive, so drop the socket rather
+                # than let the next command read it as its own reply.
+                self.close()
+                timed_out = True
                 break
-            if not chunk:
+            if not n:
+                # Peer closed its end (cgminer does after every reply), so
+                # the next command has to reconnect anyway.
+                self.close()
                 break
-            chunks.append(chunk)
-
-        raw = b"".join(chunks)
-        raw = raw.replace(b"\x00", b"")  # some miners NUL-terminate JSON
-        return raw.decode("utf-8", errors="ignore")
+            off += n
+            if buf[off - 1] == 0:
+                # cgminer/bmminer NUL-terminate the reply: it is complete, no
+                # need to wait for the peer to close (or for the timeout).
+                off -= 1
+                break
+        view.release()
+        return buf[:off].decode("utf-8", errors="ignore"), timed_out
 
     def command(self, *args):
         """
@@ -106,7 +183,9 @@ class Core(object):
         raise_exception(response, message)
 
     def _send(self, command):
-        response = self.send_command(command)
+        return self._check(self.send_command(command))
+
+    def _check(self, response):
         try:
             success = (response['STATUS'][0]['STATUS'] in [STATUS_INFO, STATUS_SUCCESS])
         except:
@@ -118,7 +197,43 @@ class Core(object):
         return response
 
 
+# Pool field names seen across firmwares, most common first.
+_URL_KEYS = ('URL', 'Stratum URL', 'Stratum', 'StratumURL')
+_USER_KEYS = ('User', 'Worker', 'UserName', 'Username')
+_STATUS_KEYS = ('Status', 'Stratum Status', 'StratumActive')
+_PRIORITY_KEYS = ('Priority', 'PRIORITY')
+_STRATUM_ACTIVE_KEYS = ('Stratum Active', 'StratumActive')
+
+
+def _first(d, keys):
+    """Value of the first key present in d; unlike an `or` chain, keeps 0/False."""
+    for k in keys:
+        v = d.get(k)
+        if v is not None:
+            return v
+    return None
+
+
+def _to_int(v):
+    try:
+        return int(v)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_bool(v):
+    if isinstance(v, bool):
+        return v
+    if isinstance(v, str):
+        return v.lower() in {'1', 'true', 'yes', 'y', 'on', 'alive'}
+    if isinstance(v, (int, float)):
+        return v != 0
+    return None
+
+
 class BaseClient(Core):
+    # Set by LocalMiners.discover(); version() then answers without a round trip
+    cached_version = None
 
     def stats(self):
         """
@@ -141,14 +256,38 @@ class BaseClient(Core):
         This returns a number of important version numbers for the miner. Each of the
         version numbers is an instance of Version from the SemVer Python package.
         """
+        if self.cached_version is not None:
+            return self.cached_version
+        return self._parse_version(self.command('version'))
+
+    def stats_and_version(self):
+        """
+        Get stats() and version() in a single round trip.
+
+        Uses the joined command syntax ('stats+version'), which replies with
+        {"stats": [<stats reply>], "version": [<version reply>]}. Firmware that
+        does not support joined commands gets two separate calls instead.
+        """
+        if self.cached_version is not None:
+            return self.stats(), self.cached_version
+
+        resp = self.send_command('stats+version')
+        try:
+            stats = resp['stats'][0]
+            version = resp['version'][0]
+        except (KeyError, IndexError, TypeError):
+            return self.stats(), self.version()
+
+        return stats, self._parse_version(self._check(version))
+
+    def _parse_version(self, resp):
+        """Normalize a raw `version` reply into the dict returned by version()."""
         fields = [
             ('Type', 'model', str),
             ('API', 'api', parse_version_number),
             # ('Miner', 'version', parse_version_number),
         ]
 
-        resp = self.command('version')
-
         version = {}
         for from_name, to_name, formatter in fields:
             try:
@@ -197,12 +336,10 @@ class BaseClient(Core):
 
         for p in pools_raw:
             # Different firmwares use different field names; be defensive.
-            url = (p.get('URL') or p.get('Stratum URL') or p.get('Stratum') or
-                   p.get('StratumURL'))
-            user = (p.get('User') or p.get('Worker') or p.get('UserName') or
-                    p.get('Username'))
-            status = p.get('Status') or p.get('Stratum Status') or p.get('StratumActive')
-            prio = p.get('Priority') or p.get('PRIORITY')
+            url = _first(p, _URL_KEYS)
+            user = _first(p, _USER_KEYS)
+            status = _first(p, _STATUS_KEYS)
+            prio = _first(p, _PRIORITY_KEYS)
 
             # Optional metrics
             quota = p.get('Quota')
@@ -210,11 +347,7 @@ class BaseClient(Core):
             rejected = p.get('Rejected')
 
             # Some firmwares expose a boolean-ish field
-            stratum_active = (
-                p.get('Stratum Active') if 'Stratum Active' in p
-                else p.get('StratumActive') if 'StratumActive' in p
-                else None
-            )
+            stratum_active = _first(p, _STRATUM_ACTIVE_KEYS)
 
             out.append({
                 'url': url,
@@ -230,21 +363,11 @@ class BaseClient(Core):
             })
 
         return out
-    
-def _to_int(v):
-    try:
-        return int(v)
-    except (TypeError, ValueError):
-        return None
-
-def _to_bool(v):
-    if isinstance(v, bool):
-        return v
-    if isinstance(v, str):
-        return v.lower() in {'1', 'true', 'yes', 'y', 'on', 'alive'}
-    if isinstance(v, (int, float)):
-        return v != 0
-    return None
 
-    def __getattr__(self, name, *args):
+    def __getattr__(self, name):
+        # Any other attribute is treated as a raw API command, e.g.
+        # client.summary() or client.devs(). Private/dunder lookups (copy,
+        # pickle, hasattr probes) must still fail normally.
+        if name.startswith('_'):
+            raise AttributeError(name)
         return lambda *x: self.command(name, *x)
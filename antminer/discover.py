@@ -1,13 +1,46 @@
+import errno
 import socket
+import selectors
+import struct
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from antminer.constants import DEFAULT_PORT
 from antminer.base import BaseClient
 import ipaddress
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List
-from netutils import resolve_mac
+from typing import Iterable, List
+from netutils import arp_table, resolve_mac
+
+# struct linger {l_onoff=1, l_linger=0}: close() resets the connection
+_LINGER_RST = struct.pack('ii', 1, 0)
+
+
+def _probe_limit(wanted: int) -> int:
+    """
+    Cap the sockets a sweep holds open (probes in flight plus connected ones
+    kept for reuse) so it cannot exhaust the process fd limit.
+    """
+    try:
+        import resource
+    except ImportError:
+        return min(wanted, 500)  # Windows: select() handles at most 512 sockets
+    soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY:
+        return wanted
+    return max(1, min(wanted, soft - 64))  # headroom for the rest of the process
+
+
+def _try_version(cli: BaseClient) -> dict | None:
+    try:
+        return cli.version()
+    except Exception:
+        return None  # left uncached; version() will ask the miner again
+
+
 class LocalMiners(object):
     TIMEOUT = 0.05
-    MAX_PROBES = 256   # threads per discover() call
+    MAX_PROBES = 1024  # connect() calls in flight per discover() call
+    MAX_VERSION_WORKERS = 32  # threads fetching version() after the sweep
 
     def __init__(self):
         sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -18,42 +51,87 @@ class LocalMiners(object):
         self._miner_index = 0
         self._miners = None
 
-    def _is_up(self, addr):
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(self.TIMEOUT)
-        if not sock.connect_ex((addr, DEFAULT_PORT)):
-            is_up = True
-        else:
-            is_up = False
-
-        sock.close()
-        return is_up
-    
-    def _probe(self, ip: str) -> BaseClient | None:
+    def _open_probe(self, ip: str) -> socket.socket | None:
+        """Start a non-blocking connect() to ip; None if it failed outright."""
         try:
-            with socket.create_connection((ip, DEFAULT_PORT), self.TIMEOUT):
-                cli = BaseClient(ip)
-                # Best-effort MAC lookup (same L2 only)
-                try:
-                    cli.mac_addr = resolve_mac(ip)  # dynamic attribute; or extend BaseClient
-                    print(f'scanning: {ip} - found - MAC: {cli.mac_addr}\n')
-                except Exception:
-                    cli.mac_addr = None
-                return cli
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         except OSError:
+            return None  # e.g. EMFILE/ENOBUFS: skip the host, keep sweeping
+        try:
+            # Close with RST instead of parking in TIME_WAIT, so repeated sweeps
+            # cannot pile up sockets and exhaust ephemeral ports.
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, _LINGER_RST)
+            if hasattr(socket, "TCP_QUICKACK"):  # Linux only
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+            sock.setblocking(False)
+            rc = sock.connect_ex((ip, DEFAULT_PORT))
+        except OSError:
+            rc = None
+        if rc not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+            sock.close()
             return None
-        
-    def ori_discover(self):
+        return sock
+
+    def _sweep(self, ips: Iterable[str]) -> list[tuple[str, socket.socket | None]]:
+        """
+        Probe every ip from a single thread: keep up to MAX_PROBES
+        non-blocking connect() calls registered on one selector (epoll on
+        Linux) and classify each as up/down from SO_ERROR once writable.
+        Returns (ip, connected socket) pairs for the hosts that answered.
+
+        Connected sockets count against the same fd budget as the probes.
+        Once they fill it, the oldest ones are closed and returned as
+        (ip, None), so those clients simply reconnect on first use.
+        """
         found = []
-        for ip in range(1, 256):
-            addr = '{network}{ip}'.format(network=self.network, ip=str(ip))
-            if self._is_up(addr):
-                print(f'scanning: {addr} - found')
-                found.append(BaseClient(addr))
+        kept = 0  # found[released:] still hold an open socket
+        released = 0
+        hosts = iter(ips)
+        window = deque()  # (deadline, sock) in registration order
+        limit = _probe_limit(self.MAX_PROBES)
+        with selectors.DefaultSelector() as sel:
+            while True:
+                while len(sel.get_map()) < limit:
+                    ip = next(hosts, None)
+                    if ip is None:
+                        break
+                    if len(sel.get_map()) + kept >= limit:
+                        # Make room for this probe: stop reusing the oldest
+                        # connected socket.
+                        old_ip, old_sock = found[released]
+                        old_sock.close()
+                        found[released] = (old_ip, None)
+                        released += 1
+                        kept -= 1
+                    sock = self._open_probe(ip)
+                    if sock is not None:
+                        sel.register(sock, selectors.EVENT_WRITE, ip)
+                        window.append((time.monotonic() + self.TIMEOUT, sock))
+                if not sel.get_map():
+                    break
+
+                for key, _ in sel.select(max(0.0, window[0][0] - time.monotonic())):
+                    sock = key.fileobj
+                    sel.unregister(sock)
+                    if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                        found.append((key.data, sock))
+                        kept += 1
+                    else:
+                        sock.close()
 
+                # Give up on probes that did not connect within TIMEOUT
+                now = time.monotonic()
+                while window and window[0][0] <= now:
+                    _, sock = window.popleft()
+                    try:
+                        sel.unregister(sock)
+                    except (KeyError, ValueError):
+                        continue  # already classified above
+                    sock.close()
         return found
-    
-    def discover(self, subnet: str = "192.168.0.0/24") -> List[BaseClient]:
+
+    def discover(self, subnet: str = "192.168.0.0/24",
+                 resolve_versions: bool = True) -> List[BaseClient]:
         """
         Scan the given CIDR (or x.x.x.* pattern) for miners that respond on
         TCP port 4028 (the cgminer/bmminer JSON‑RPC port).
@@ -61,6 +139,10 @@ class LocalMiners(object):
         `subnet` may be:
             • CIDR –  '192.168.2.0/24'
             • Wildcard – '192.168.2.*'  (converted to /24 automatically)
+
+        With `resolve_versions`, every found miner's version() is fetched in
+        parallel (over the socket left open by the sweep) and cached on the
+        client, so callers do not pay one sequential round trip per miner.
         """
         if subnet.endswith(".*"):
             subnet = subnet.replace(".*", ".0/24")
@@ -68,11 +150,33 @@ class LocalMiners(object):
         net = ipaddress.IPv4Network(subnet, strict=False)
 
         miners: list[BaseClient] = []
-        with ThreadPoolExecutor(max_workers=self.MAX_PROBES) as pool:
-            fut = {pool.submit(self._probe, str(ip)): ip for ip in net.hosts()}
-            for f in as_completed(fut):
-                if cli := f.result():
-                    miners.append(cli)
+        # Format every address once up front, outside the probe loop
+        ips = list(map(str, net.hosts()))
+        found = self._sweep(ips)
+        # Best-effort MAC lookup (same L2 only): the sweep has just filled the
+        # ARP cache, so read it once (fresh) instead of resolving host by host.
+        arp = arp_table(max_age=0)
+        for ip, sock in found:
+            # Hand the live socket to the client so its first command reuses
+            # it instead of paying a second handshake (None if the sweep had
+            # to give it up; the client then connects on first use).
+            cli = BaseClient(ip)
+            if sock is not None:
+                cli.attach(sock)
+            if arp is not None:
+                cli.mac_addr = arp.get(ip)
+            else:
+                try:
+                    cli.mac_addr = resolve_mac(ip)
+                except Exception:
+                    cli.mac_addr = None
+            print(f'scanning: {ip} - found - MAC: {cli.mac_addr}\n')
+            miners.append(cli)
+
+        if resolve_versions and miners:
+            with ThreadPoolExecutor(max_workers=min(self.MAX_VERSION_WORKERS, len(miners))) as pool:
+                for cli, version in zip(miners, pool.map(_try_version, miners)):
+                    cli.cached_version = version
         return miners
 
     def __iter__(self):
@@ -14,8 +14,9 @@ Run with:
 
 Notes
 -----
-* Uses blocking I/O – fine for a handful of local miners. For hundreds, wrap
-  calls in `run_in_threadpool()` or migrate to `anyio`/`asyncio` sockets.
+* Miner calls use blocking sockets, run via `asyncio.to_thread()` on a pool of
+  `IO_WORKERS` threads so requests to different miners proceed in parallel.
+  Up to `POOL_SIZE` warm clients are kept per miner IP.
 * Antminer API commands are vendor‑specific. "reset", "restart", "addpool"
   work on most CGMiner/BMMiner builds shipped in the last ~7 years.
 * Worker‑name filtering is *best‑effort*; some firmwares omit it from stats.
@@ -23,15 +24,36 @@ Notes
 
 from __future__ import annotations
 
+import asyncio
 import socket
-from typing import Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from ipaddress import IPv4Address
+from typing import AsyncIterator, Optional
 
 from fastapi import Body, FastAPI, HTTPException, status
 from pydantic import BaseModel, Field, IPvAnyAddress
 
 from antminer.base import BaseClient
 
-app = FastAPI(title="Antminer Control API", version="0.1.0")
+IO_WORKERS = 64  # threads available to asyncio.to_thread() for miner I/O
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Size the pool behind asyncio.to_thread() so concurrent requests to
+    # different miners run in parallel instead of queueing on a few threads.
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="miner-io")
+    )
+    yield
+    for queue in CLIENT_POOL.values():
+        while not queue.empty():
+            queue.get_nowait()[1].close()
+
+
+app = FastAPI(title="Antminer Control API", version="0.1.0", lifespan=lifespan)
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -58,18 +80,14 @@ class MinerSummary(BaseModel):
 # Helper layer – minimal defensive parsing around the raw JSON‑RPC output
 # ──────────────────────────────────────────────────────────────────────────────
 
-def build_client(ip: str) -> BaseClient:
-    """Validate the IP string and return a BaseClient bound to it."""
-    try:
-        socket.inet_aton(ip)
-    except OSError:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid IP address")
-    return BaseClient(ip)
-
+def parse_summary(stats: list[dict], version: dict, worker: str, ip: IPv4Address) -> MinerSummary:
+    # Group blocks by TYPE in one pass instead of rescanning stats per lookup
+    by_type: dict[str, list[dict]] = {}
+    for s in stats:
+        by_type.setdefault(s.get("TYPE", "").lower(), []).append(s)
 
-def parse_summary(stats: list[dict], version: dict, worker: str, ip: str) -> MinerSummary:
-    summary_block = next((s for s in stats if s.get("TYPE", "").lower() in {"summary", "stats"}), {})
-    pool_blocks = [s for s in stats if s.get("TYPE") == "pool"]
+    summary_block = (by_type.get("summary") or by_type.get("stats") or [{}])[0]
+    pool_blocks = by_type.get("pool", [])
 
     # If a worker name was supplied, filter pools by Worker field (best‑effort)
     if worker:
@@ -78,12 +96,13 @@ def parse_summary(stats: list[dict], version: dict, worker: str, ip: str) -> Min
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Worker not found in miner stats")
 
     pools = [p.get("URL", "?") for p in pool_blocks]
+    firmware = version.get("miner", {}).get("version")  # semantic_version.Version
 
     return MinerSummary(
         ip=ip,
         worker=worker,
         model=version.get("model"),
-        firmware=version.get("miner", {}).get("version"),
+        firmware=str(firmware) if firmware is not None else None,
         hashrate_5s=_to_f(summary_block.get("GHS 5s")),
         hashrate_avg=_to_f(summary_block.get("GHS av")),
         temperature=_to_f(summary_block.get("temp2") or summary_block.get("temp")),
@@ -91,6 +110,14 @@ def parse_summary(stats: list[dict], version: dict, worker: str, ip: str) -> Min
     )
 
 
+def replace_pool(client: BaseClient, settings: PoolSettings) -> None:
+    """Swap pool #0 for *settings*, issuing both commands on one client session."""
+    # 1) Remove current pool 0 ("removepool,0")
+    client.command("removepool", "0")
+    # 2) Add replacement ("addpool,url,user,pass")
+    client.command("addpool", f"{settings.url},{settings.username},{settings.password}")
+
+
 def _to_f(v) -> Optional[float]:
     try:
         return float(v)
@@ -98,61 +125,215 @@ def _to_f(v) -> Optional[float]:
         return None
 
 
+# ──────────────────────────────────────────────────────────────────────────────
+# Connection pool – warm BaseClients per miner IP
+# ──────────────────────────────────────────────────────────────────────────────
+POOL_SIZE = 2          # idle clients kept per miner
+POOL_IDLE_TTL = 30.0   # seconds an idle client may wait before being dropped
+
+CLIENT_POOL: dict[str, asyncio.Queue[tuple[float, BaseClient]]] = {}
+
+
+def _idle_socket_usable(sock: socket.socket) -> bool:
+    """True if an idle socket is still open and has nothing unread on it.
+
+    Stock cgminer/bmminer close the connection after every reply, so on that
+    firmware a pooled client is normally found dead here. It is then dropped
+    and the request connects afresh, instead of sending into the closed socket
+    and going through send_command's EOF -> reconnect retry.
+    """
+    timeout = sock.gettimeout()
+    sock.setblocking(False)
+    try:
+        sock.recv(1, socket.MSG_PEEK)  # b"" = peer closed; bytes = stray reply data
+        return False
+    except BlockingIOError:
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.settimeout(timeout)
+
+
+async def acquire(ip: str) -> BaseClient:
+    """Return a warm pooled client for *ip*, or a new one if none is usable."""
+    queue = CLIENT_POOL.get(ip)
+    while queue is not None and not queue.empty():
+        idle_since, client = queue.get_nowait()
+        if (
+            client.conn is not None
+            and time.monotonic() - idle_since < POOL_IDLE_TTL
+            and _idle_socket_usable(client.conn)
+        ):
+            return client
+        client.close()
+    return BaseClient(ip)
+
+
+def release(ip: str, client: BaseClient) -> None:
+    """Put a healthy client back; close it if it lost its socket or the pool is full."""
+    queue = CLIENT_POOL.get(ip)
+    if queue is None:
+        queue = CLIENT_POOL[ip] = asyncio.Queue(maxsize=POOL_SIZE)
+    if client.conn is None or queue.full():
+        client.close()
+        return
+    queue.put_nowait((time.monotonic(), client))
+
+
+@asynccontextmanager
+async def pooled_client(ip: str) -> AsyncIterator[BaseClient]:
+    """Borrow a client for one request; clients that raised are discarded."""
+    client = await acquire(ip)
+    try:
+        yield client
+    except BaseException:
+        client.close()
+        raise
+    release(ip, client)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Version cache – model/firmware only change on reboot or upgrade
+# ──────────────────────────────────────────────────────────────────────────────
+VERSION_TTL = 3600.0   # seconds
+
+_VERSION_CACHE: dict[str, tuple[float, dict]] = {}
+
+
+async def fetch_stats_and_version(ip: str, client: BaseClient) -> tuple[dict, dict]:
+    """Return (stats, version); the version is asked for at most once per VERSION_TTL.
+
+    On a cache miss both are fetched in one round trip ("stats+version").
+    """
+    hit = _VERSION_CACHE.get(ip)
+    if hit is not None and time.monotonic() - hit[0] < VERSION_TTL:
+        return await asyncio.to_thread(client.stats), hit[1]
+    stats, version = await asyncio.to_thread(client.stats_and_version)
+    _VERSION_CACHE[ip] = (time.monotonic(), version)
+    return stats, version
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Summary cache – dashboards poll; coalesce them into one miner round trip
+# ──────────────────────────────────────────────────────────────────────────────
+SUMMARY_TTL = 3.0   # seconds a fetched (stats, version) pair is reused
+
+_SUMMARY_CACHE: dict[str, tuple[float, tuple[dict, dict]]] = {}
+_SUMMARY_GEN: dict[str, int] = {}   # bumped by invalidate_summary()
+_INFLIGHT: dict[str, asyncio.Task] = {}
+
+
+def invalidate_summary(ip: str) -> None:
+    """Forget cached data for *ip* after a command that changes it.
+
+    A fetch already in flight started before the change: it must not store its
+    result, and later callers must not join it.
+    """
+    _SUMMARY_GEN[ip] = _SUMMARY_GEN.get(ip, 0) + 1
+    _SUMMARY_CACHE.pop(ip, None)
+    _INFLIGHT.pop(ip, None)
+
+
+async def _fetch_summary(ip: str) -> tuple[dict, dict]:
+    gen = _SUMMARY_GEN.get(ip, 0)
+    async with pooled_client(ip) as client:
+        result = await fetch_stats_and_version(ip, client)
+    stats, version = result
+    if not isinstance(stats, dict) or not isinstance(version, dict):
+        # send_command hands back the raw text on a timeout or non-JSON reply;
+        # fail this fetch instead of caching something parse_summary can't use
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"unexpected reply from miner {ip}",
+        )
+    if _SUMMARY_GEN.get(ip, 0) == gen:
+        _SUMMARY_CACHE[ip] = (time.monotonic(), result)
+    return result
+
+
+async def shared_stats_and_version(ip: str) -> tuple[dict, dict]:
+    """(stats, version) for *ip*, at most SUMMARY_TTL old.
+
+    Concurrent callers for the same IP share a single in-flight fetch.
+    """
+    hit = _SUMMARY_CACHE.get(ip)
+    if hit is not None:
+        if time.monotonic() - hit[0] < SUMMARY_TTL:
+            return hit[1]
+        del _SUMMARY_CACHE[ip]
+
+    task = _INFLIGHT.get(ip)
+    if task is None:
+        task = asyncio.create_task(_fetch_summary(ip))
+        _INFLIGHT[ip] = task
+        # Only clear our own entry; invalidate_summary() may have replaced it
+        task.add_done_callback(
+            lambda t: _INFLIGHT.pop(ip) if _INFLIGHT.get(ip) is t else None
+        )
+    # shield: one caller disconnecting must not cancel the fetch for the rest
+    return await asyncio.shield(task)
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Routes
 # ──────────────────────────────────────────────────────────────────────────────
 
 @app.get("/miners/{ip}/{worker}/summary", response_model=MinerSummary)
-async def get_summary(ip: str, worker: str):
+async def get_summary(ip: IPv4Address, worker: str):
     """Return current performance/temperature metrics for a given worker."""
-    client = build_client(ip)
     try:
-        stats = client.stats()      # list of dicts
-        version = client.version()  # dict
+        stats, version = await shared_stats_and_version(str(ip))
+    except HTTPException:
+        raise
     except Exception as exc:
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc))
 
-    return parse_summary(stats, version, worker, ip)
+    return parse_summary(stats.get("STATS", []), version, worker, ip)
 
 
 @app.post("/miners/{ip}/{worker}/reset", status_code=status.HTTP_202_ACCEPTED)
-async def reset_miner(ip: str, worker: str):
+async def reset_miner(ip: IPv4Address, worker: str):
     """Soft reset the cgminer/bmminer process."""
-    client = build_client(ip)
-    try:
-        resp = client.command("reset")
-        return {"status": "reset issued", "response": resp}
-    except Exception as exc:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc))
+    host = str(ip)
+    async with pooled_client(host) as client:
+        try:
+            resp = await asyncio.to_thread(client.command, "reset")
+        except Exception as exc:
+            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc))
+    return {"status": "reset issued", "response": resp}
 
 
 @app.post("/miners/{ip}/{worker}/reboot", status_code=status.HTTP_202_ACCEPTED)
-async def reboot_miner(ip: str, worker: str):
+async def reboot_miner(ip: IPv4Address, worker: str):
     """Reboot the whole device (same as pressing the physical reset button)."""
-    client = build_client(ip)
-    try:
-        resp = client.command("restart")  # older firmwares use "reboot"
-        return {"status": "reboot issued", "response": resp}
-    except Exception as exc:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc))
+    host = str(ip)
+    async with pooled_client(host) as client:
+        try:
+            resp = await asyncio.to_thread(client.command, "restart")  # older firmwares use "reboot"
+        except Exception as exc:
+            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc))
+    _VERSION_CACHE.pop(host, None)  # may come back with new firmware
+    invalidate_summary(host)
+    return {"status": "reboot issued", "response": resp}
 
 
 @app.post("/miners/{ip}/{worker}/pool", status_code=status.HTTP_202_ACCEPTED)
-async def set_pool(ip: str, worker: str, settings: PoolSettings = Body(...)):
+async def set_pool(ip: IPv4Address, worker: str, settings: PoolSettings = Body(...)):
     """Replace the current pool credentials with a new (url, user, pass) tuple.
 
     On most miners you *cannot* change just one field; you must provide the full
     trio. The command below deletes the existing pool #0 then adds a new one.
     """
-    client = build_client(ip)
-    try:
-        # 1) Remove current pool 0 ("removepool,0")
-        client.command("removepool", "0")
-        # 2) Add replacement ("addpool,url,user,pass")
-        client.command("addpool", f"{settings.url},{settings.username},{settings.password}")
-        return {"status": "pool updated", "new_pool": settings.dict()}
-    except Exception as exc:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc))
+    host = str(ip)
+    async with pooled_client(host) as client:
+        try:
+            await asyncio.to_thread(replace_pool, client, settings)
+        except Exception as exc:
+            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc))
+    _VERSION_CACHE.pop(host, None)
+    invalidate_summary(host)
+    return {"status": "pool updated", "new_pool": settings.dict()}
 
 
 # ──────────────────────────────────────────────────────────────────────────────
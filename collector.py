@@ -3,12 +3,14 @@ from __future__ import annotations
 
 import datetime
 import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING, Optional,List,Dict
 
 from pydantic import BaseModel, Field
 
 from antminer.base import BaseClient
-from rate_units import convert_from_ghs
+from rate_units import format_rate
 if TYPE_CHECKING:
     from db import DB
     from rest_client import RestClient
@@ -52,10 +54,12 @@ class Collector:
         db: Optional["DB"] = None,
         rest_client: Optional["RestClient"] = None,
         rest_path: str = "",
+        max_workers: int = 32,
     ) -> None:
         self.db = db
         self.rest = rest_client
         self.rest_path = rest_path
+        self.max_workers = max_workers
 
     # ------------------------------------------------------------------ #
     # Public
@@ -63,9 +67,10 @@ class Collector:
 
     def collect(self, miner: BaseClient) -> None:
         try:
-            record = self._extract_data(
-                miner.host, miner.stats(), miner.version()
-            )
+            with miner:
+                record = self._extract_data(
+                    miner.host, miner.stats(), miner.version()
+                )
         except Exception as exc:
             record = CollectorData(ip=miner.host, is_online=False)
             logging.warning("[Collector] %s marked offline – %s", miner.host, exc)
@@ -73,34 +78,36 @@ class Collector:
         self._persist(record)
 
     def collect_all(self, miners: list[BaseClient]) -> None:
-        records = []
-        for miner in miners:
-            # if miner.host == '192.168.23.52':
-            #     print(f'Collecting data from miner: {miner.host}')
-            # print(f'Collecting data from miner: {miner.host}')
-            try:
-                record = self._extract_data(
-                    miner.host, miner.stats(), miner.version(),miner.pools()
-                )
-            except Exception as exc:
-                record = CollectorData(ip=miner.host, is_online=False)
-                logging.warning("[Collector] %s marked offline – %s", miner.host, exc)
-      
-            records.append(record)
-    
+        # Each miner is a handful of blocking socket round-trips, so fan them
+        # out over a thread pool; persisting stays a single batched call.
+        if not miners:
+            return
+        workers = min(self.max_workers, len(miners))
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            records = list(ex.map(self._fetch_one, miners))
+
         self._persist_all(records)
+
+    def _fetch_one(self, miner: BaseClient) -> CollectorData:
+        try:
+            with miner:
+                return self._extract_data(
+                    miner.host, miner.stats(), miner.version(), miner.pools()
+                )
+        except Exception as exc:
+            logging.warning("[Collector] %s marked offline – %s", miner.host, exc)
+            return CollectorData(ip=miner.host, is_online=False)
+
     def collect_all_online(self, miners: list[BaseClient]) -> None:
         records = []
 
         for miner in miners:
-            # if miner.host == '192.168.23.52':
-            #     print(f'Collecting data from miner: {miner.host}')
-            # print(f'Collecting data from miner: {miner.host}')
-            miner.connect()
+            if miner.conn is None:  # discover() may already hold a live socket
+                miner.connect()
             minerCon = miner.conn
             try:
                 if minerCon is not None:
-                    record = CollectorData(
+                    record = CollectorData.model_construct(
                         ip=miner.host, is_online=True,mac_address=miner.mac_addr
                     )
                     records.append(record)
@@ -109,7 +116,7 @@ class Collector:
                 logging.warning("[Collector] %s marked offline – %s", miner.host, exc)
       
             # records.append(record)
-        print(f"[Scanner] → {len(miners)} miners(s) online")
+        logging.info("[Collector] %d miner(s) online", len(miners))
         self._persist_all(records)
 
     # ------------------------------------------------------------------ #
@@ -124,9 +131,11 @@ class Collector:
         logging.info("[Collector] stored & pushed %s", record.ip)
 
     def _persist_all(self, records: list[CollectorData]) -> None:
-        for record in records:
-            if self.db:
-                self.db.insert(record)
+        if not records:
+            return
+
+        if self.db:
+            self.db.insert_many(records)
 
         if self.rest:
             payload = {"results": [_format_result(r, wrap=False) for r in records]}
@@ -138,111 +147,72 @@ class Collector:
     @staticmethod
     def _extract_data(ip: str, stats: dict, version: dict, pools: list[dict]) -> CollectorData:
         # Expect cgminer/bmminer-like payloads where stats["STATS"][1] holds summary
-        summary = (stats or {}).get("STATS", [{}])
-        summary = summary[1] if len(summary) > 1 else (summary[0] if summary else {})
+        # (falls back to STATS[0], or {} when the reply has no STATS blocks)
+        blocks = (stats or {}).get("STATS") or ()
+        summary = (blocks[1:2] or blocks[:1] or ({},))[0]
         pool_stat = pools[0] if pools else {}
-        # if version is not None:
-        #     if version.get("model").lower().endswith("s21"):
-        #         print(f'stats: {stats}')
-            
+
         # ---- Normalize dynamic fields ----
-        # Fans: fan1..fanN → fans: List[int]
+        # One pass over the summary; _PREFIX_DISPATCH routes each per-chain/per-fan
+        # key (temp2_1, chain_hw3, fan2, ...) to its handler by first char, then prefix.
         fan_num = _to_i(summary.get("fan_num")) or 0
-        fans: list[int] = []
-        for i in range(1, fan_num + 1):
-            key = f"fan{i}"
-            if key in summary:
-                val = _to_i(summary.get(key))
-                if val is not None:
-                    fans.append(val)
-
-        # Temps: only temp2_x, temp_in_chip_x, temp_out_chip_x → temps: Dict[str, int]
-        card = {} # cards temperature list
-        # temps = {}
+        acc = {"card": {}, "chain_hw": {}, "chain_avg": {}, "chain_avg_alt": {}, "fans": {}}
         for k, v in summary.items():
             if not isinstance(k, str):
                 continue
-            if (
-                k.startswith("temp2_")       # e.g. temp2_1, temp2_2, temp2_3
-                or k.startswith("temp_in_chip_")   # e.g. temp_in_chip_1..3
-                or k.startswith("temp_out_chip_")  # e.g. temp_out_chip_1..3
-                or k.startswith("chain_rate")
-                or k.startswith("chain_acn")
-            ):
-                # iv = _to_i(v)
-                # if iv is not None:
-                    # temps[k] = iv
-                if card.get(k[-1]) is None:
-                    card[k[-1]] = {
-                        "temp":None,
-                        "temp_in":None,
-                        "temp_out":None,
-                        "hashrate":None,
-                        "chain_acn":None,
-                    }
-                if k.startswith("temp2_"):
-                    iv = _to_i(v)
-                    if iv is not None:
-                        card[k[-1]]["temp"] =  iv
-                elif k.startswith("temp_in_chip_"):
-                    card[k[-1]]["temp_in"] = v    
-                elif k.startswith("temp_out_chip_"):
-                    card[k[-1]]["temp_out"] = v
-                elif k.startswith("chain_rate"):
-                    card[k[-1]]["hashrate"] = _to_f(v)
-                elif k.startswith("chain_acn"):
-                    card[k[-1]]["chain_acn"] = _to_i(v) 
-
-        # Chains HW errors: chain_hw1..chain_hwN → chain_hw: List[int]
-        chain_hw: list[int] = []
-        for i in range(1, 128):  # safe upper bound
-            key = f"chain_hw{i}"
-            if key not in summary:
-                if i > 1:
-                    break
+            # Most summary keys (GHS av, miner_count, ...) stop at this lookup
+            prefixes = _PREFIX_DISPATCH.get(k[:1])
+            if prefixes is None:
                 continue
-            iv = _to_i(summary.get(key))
-            if iv is not None:
-                chain_hw.append(iv)
-
-        # Chains avg hashrate: support both "chain_avg_hashrate1" and "CHAIN AVG HASHRATE1"
-        chain_avg_hashrate: list[str] = []
-        for i in range(1, 128):
-            val = summary.get(f"chain_avg_hashrate{i}")
-            if val is None:
-                val = summary.get(f"CHAIN AVG HASHRATE{i}")
-            if val is None:
-                if i > 1:
+            for prefix, handle in prefixes:
+                if k.startswith(prefix):
+                    idx = k[len(prefix):]
+                    if idx.isdigit():
+                        handle(acc, idx, v)
                     break
-                continue
-            chain_avg_hashrate.append(str(val))
 
+        card = acc["card"]
+        # Fans: fan1..fanN → fans: List[int]
+        fans = [v for i, v in sorted(acc["fans"].items()) if 1 <= i <= fan_num]
+        # Chains HW errors: chain_hw1..chain_hwN → chain_hw: List[int]
+        chain_hw = [v for v in _leading_run(acc["chain_hw"]) if v is not None]
+        # Chains avg hashrate: "chain_avg_hashrate1" wins over "CHAIN AVG HASHRATE1"
+        chain_avg = {**acc["chain_avg_alt"], **acc["chain_avg"]}
+        chain_avg_hashrate = _leading_run(chain_avg)
+
+        # Only fields with a value are passed; the rest keep the model defaults.
+        # Values are already normalised here; skip Pydantic's validators.
+        data = {"ip": ip, "fan_num": fan_num}
+        if version and (v := version.get("model")) is not None:
+            data["model"] = v
+        if (v := summary.get("GHS av") or summary.get("GHS_av") or summary.get("rate_30m")) is not None:
+            data["hashrate_avg"] = _to_f(v)
         # Choose a representative temperature for the top-level "temperature" field
-        primary_temp = (
-            summary.get("temp_max")
-            or summary.get("temp2")
-            or summary.get("temp")
-        )
-        
-
-        return CollectorData(
-            ip=ip,
-            model=version.get("model") if version and version.get("model") is not None else None,
-            hashrate_avg=_to_f(summary.get("GHS av") or summary.get("GHS_av") or summary.get("rate_30m")) if summary else None,
-            temperature=_to_f(primary_temp) if primary_temp is not None else None,
-            worker_name=pool_stat.get("workername") if pool_stat and pool_stat.get("workername") is not None else None,
-            pool=pool_stat.get("url") if pool_stat and pool_stat.get("url") is not None else None,
-            miner_count=_to_i(summary.get("miner_count")) if summary and summary.get("miner_count") is not None else None,
-            frequency=_to_i(summary.get("frequency")) if summary and summary.get("frequency") is not None else None,
-            fan_num=fan_num if fan_num is not None else None,
-            fans=fans if fans else None,
-            card=card if card else None,
-            chain_hw=chain_hw if chain_hw else None,
-            chain_avg_hashrate=chain_avg_hashrate if chain_avg_hashrate else None,
-            temp_max=_to_i(summary.get("temp_max")) if summary and summary.get("temp_max") is not None else None,
-            total_rate_ideal=_to_f(summary.get("total_rateideal")) if summary and summary.get("total_rateideal") is not None else None,
-        )
-
+        temp_max = summary.get("temp_max")
+        if (v := temp_max or summary.get("temp2") or summary.get("temp")) is not None:
+            data["temperature"] = _to_f(v)
+        if temp_max is not None:
+            data["temp_max"] = _to_i(temp_max)
+        if (v := pool_stat.get("workername")) is not None:
+            data["worker_name"] = v
+        if (v := pool_stat.get("url")) is not None:
+            data["pool"] = v
+        if (v := summary.get("miner_count")) is not None:
+            data["miner_count"] = _to_i(v)
+        if (v := summary.get("frequency")) is not None:
+            data["frequency"] = _to_i(v)
+        if (v := summary.get("total_rateideal")) is not None:
+            data["total_rate_ideal"] = _to_f(v)
+        if fans:
+            data["fans"] = fans
+        if card:
+            data["card"] = card
+        if chain_hw:
+            data["chain_hw"] = chain_hw
+        if chain_avg_hashrate:
+            data["chain_avg_hashrate"] = chain_avg_hashrate
+
+        return CollectorData.model_construct(**data)
 
 def _to_f(v) -> Optional[float]:
     try:
@@ -259,6 +229,93 @@ def _to_i(v):
     except Exception:
         return None
 
+
+# ---- _extract_data prefix handlers ----
+# Card keys keep the chain suffix as a string ("1", "2", ...); the list-valued
+# fields are keyed by int so they can be sorted back into chain order.
+def _card_slot(card: dict, idx: str) -> dict:
+    slot = card.get(idx)
+    if slot is None:
+        slot = card[idx] = {
+            "temp": None,
+            "temp_in": None,
+            "temp_out": None,
+            "hashrate": None,
+            "chain_acn": None,
+        }
+    return slot
+
+def _handle_temp(acc, idx, v):
+    iv = _to_i(v)
+    slot = _card_slot(acc["card"], idx)
+    if iv is not None:
+        slot["temp"] = iv
+
+def _handle_tin(acc, idx, v):
+    _card_slot(acc["card"], idx)["temp_in"] = v
+
+def _handle_tout(acc, idx, v):
+    _card_slot(acc["card"], idx)["temp_out"] = v
+
+def _handle_rate(acc, idx, v):
+    _card_slot(acc["card"], idx)["hashrate"] = _to_f(v)
+
+def _handle_acn(acc, idx, v):
+    _card_slot(acc["card"], idx)["chain_acn"] = _to_i(v)
+
+def _handle_hw(acc, idx, v):
+    # Kept even when unparsable: the key's presence still extends the run
+    acc["chain_hw"][int(idx)] = _to_i(v)
+
+def _handle_avg(acc, idx, v):
+    if v is not None:
+        acc["chain_avg"][int(idx)] = str(v)
+
+def _handle_avg_alt(acc, idx, v):
+    if v is not None:
+        acc["chain_avg_alt"][int(idx)] = str(v)
+
+def _handle_fan(acc, idx, v):
+    iv = _to_i(v)
+    if iv is not None:
+        acc["fans"][int(idx)] = iv
+
+def _leading_run(by_idx: dict) -> list:
+    """
+    Values for chains 1, 2, ... up to the first missing index (index 1 may be
+    absent), so a stray chain_hw5 after chain_hw1..3 does not shift positions.
+    """
+    run = []
+    i = 1 if 1 in by_idx else 2
+    while i in by_idx:
+        run.append(by_idx[i])
+        i += 1
+    return run
+
+# The suffix after the prefix must be all digits, so "fan_num" or
+# "chain_rateideal1" never land in a per-chain/per-fan slot.
+_PREFIX_TABLE = (
+    ("temp2_", _handle_temp),
+    ("temp_in_chip_", _handle_tin),
+    ("temp_out_chip_", _handle_tout),
+    ("chain_rate", _handle_rate),
+    ("chain_acn", _handle_acn),
+    ("chain_hw", _handle_hw),
+    ("chain_avg_hashrate", _handle_avg),
+    ("CHAIN AVG HASHRATE", _handle_avg_alt),
+    ("fan", _handle_fan),
+)
+
+# _PREFIX_TABLE grouped by first character ("t", "c", "C", "f"), order kept
+_PREFIX_DISPATCH: dict[str, tuple] = {}
+for _prefix, _handle in _PREFIX_TABLE:
+    _PREFIX_DISPATCH[_prefix[0]] = _PREFIX_DISPATCH.get(_prefix[0], ()) + ((_prefix, _handle),)
+del _prefix, _handle
+
+# "fan1".."fan16", built and interned once so every record shares the same key
+# objects; the literal keys below are already shared code constants.
+_FAN_KEYS = tuple(sys.intern(f"fan{i}") for i in range(1, 17))
+
 def _format_result(r: CollectorData, wrap=True) -> dict:
     result = {}
     if r.ip is not None:
@@ -273,21 +330,16 @@ def _format_result(r: CollectorData, wrap=True) -> dict:
         result["pool"] = r.pool
     # ─── Extra fields from extended CollectorData ───────────────────
     if r.card is not None:
-        # result["card"] = r.card
-        # convert all hashrate values in card from GH/s to preferred unit
-        
-        # for card_id, card_info in r.card.items():
-        #     if card_info.get("hashrate") is not None:
-        #         val, unit = convert_from_ghs(card_info["hashrate"], r.model)
-        #         card_info["hashrate"] = f"{val:.2f} {unit}"
-        # result["card"] = r.card
-        new_card = {}
-        for card_id, card_info in r.card.items():
-            new_card[card_id] = card_info.copy()
-            if card_info.get("hashrate") is not None:
-                val, unit = convert_from_ghs(card_info["hashrate"], r.model)
-                new_card[card_id]["hashrate"] = f"{val:.2f} {unit}"
-        result["card"] = new_card
+        # convert all hashrate values in card from GH/s to preferred unit;
+        # r.card itself stays numeric for the total below
+        result["card"] = {
+            card_id: (
+                {**card_info, "hashrate": format_rate(card_info["hashrate"], r.model)}
+                if card_info.get("hashrate") is not None
+                else card_info
+            )
+            for card_id, card_info in r.card.items()
+        }
         
 
     if r.hashrate_avg is not None:
@@ -297,15 +349,12 @@ def _format_result(r: CollectorData, wrap=True) -> dict:
         if r.card:
             hashrates = [c.get("hashrate") for c in r.card.values() if c.get("hashrate") is not None]
             if hashrates:
-                total_ghs = sum(hashrates)
-                val, unit = convert_from_ghs(total_ghs, r.model)
-                result["hashrate"] = f"{val:.2f} {unit}"
+                result["hashrate"] = format_rate(sum(hashrates), r.model)
             else:
                 result["hashrate"] = None
 
     if r.total_rate_ideal is not None:
-        val, unit = convert_from_ghs(r.total_rate_ideal, r.model)
-        result["total_rate_ideal"] = f"{val:.2f} {unit}"
+        result["total_rate_ideal"] = format_rate(r.total_rate_ideal, r.model)
 
     if r.miner_count is not None:
         result["miner_count"] = r.miner_count
@@ -318,7 +367,10 @@ def _format_result(r: CollectorData, wrap=True) -> dict:
 
     if r.fans:
         # e.g. {"fan1": 3450, "fan2": 3430, ...}
-        result["fans"] = {f"fan{i+1}": speed for i, speed in enumerate(r.fans)}
+        if len(r.fans) <= len(_FAN_KEYS):
+            result["fans"] = dict(zip(_FAN_KEYS, r.fans))
+        else:
+            result["fans"] = {f"fan{i+1}": speed for i, speed in enumerate(r.fans)}
 
     # if r.temps:
     #     # already dict of all temp values (temp2_1, temp_in_chip_1, temp_max, etc.)
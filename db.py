@@ -1,31 +1,92 @@
 # db.py
 import sqlite3
-from typing import Any, Dict
+import threading
+from typing import Any, Dict, Iterable, List, Tuple
 
 from pydantic import BaseModel
 
+# miner_stats columns; CollectorData fields of the same name fill them.
+_COLUMNS = {
+    "collected_at", "ip", "model", "hashrate_5s", "hashrate_avg",
+    "temperature", "worker_name", "pool", "owner_name", "is_online",
+}
+
+# Per-connection settings, applied to every thread's connection.
+# journal_mode=WAL is stored in the database file, so the schema sets it once.
+_CONN_PRAGMAS = """
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-65536;
+"""
+
+
+def _row(data: BaseModel | Dict[str, Any]) -> Dict[str, Any]:
+    if isinstance(data, BaseModel):
+        return data.model_dump(include=_COLUMNS)
+    return data
+
 
 class DB:
     """Tiny SQLite wrapper – swap out for Postgres / Influx / Timescale
     later by implementing the same interface."""
 
     def __init__(self, db_path: str = "miners.db") -> None:
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.db_path = db_path
+        # One connection per thread instead of one shared across all of them
+        self._tls = threading.local()
+        self._sql_cache: Dict[Tuple[str, ...], str] = {}
         self._create_schema()
 
+    def _conn(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use."""
+        conn = getattr(self._tls, "conn", None)
+        if conn is None:
+            # cached_statements: SQLite keeps the compiled INSERTs around as well
+            conn = sqlite3.connect(self.db_path, cached_statements=256)
+            conn.executescript(_CONN_PRAGMAS)
+            self._tls.conn = conn
+        return conn
+
     # ------------------------------------------------------------------ #
     def insert(self, data: BaseModel | Dict[str, Any]) -> None:
         """Accepts a Pydantic model or plain dict and writes a row."""
-        payload = data.dict(by_alias=True) if isinstance(data, BaseModel) else data
-        columns = ", ".join(payload.keys())
-        placeholders = ", ".join("?" for _ in payload)
-        sql = f"INSERT INTO miner_stats ({columns}) VALUES ({placeholders})"
-        self.conn.execute(sql, list(payload.values()))
-        self.conn.commit()
+        payload = _row(data)
+        conn = self._conn()
+        with conn:
+            conn.execute(self._insert_sql(tuple(payload)), list(payload.values()))
+
+    def insert_many(self, rows: Iterable[BaseModel | Dict[str, Any]]) -> None:
+        """Write a batch of rows in a single transaction.
+
+        Rows are grouped by column set and each group goes through one
+        executemany(), so a scan cycle costs one commit instead of one per row.
+        """
+        buckets: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for data in rows:
+            payload = _row(data)
+            buckets.setdefault(tuple(sorted(payload)), []).append(payload)
+
+        conn = self._conn()
+        with conn:  # BEGIN … COMMIT (ROLLBACK on error)
+            for cols, payloads in buckets.items():
+                conn.executemany(
+                    self._insert_sql(cols), [tuple(p[c] for c in cols) for p in payloads]
+                )
+
+    def _insert_sql(self, cols: Tuple[str, ...]) -> str:
+        """INSERT statement for this column tuple, built once and reused."""
+        sql = self._sql_cache.get(cols)
+        if sql is None:
+            columns = ", ".join(cols)
+            placeholders = ", ".join("?" for _ in cols)
+            sql = f"INSERT INTO miner_stats ({columns}) VALUES ({placeholders})"
+            self._sql_cache[cols] = sql
+        return sql
 
     # ------------------------------------------------------------------ #
     def _create_schema(self) -> None:
         ddl = """
+        PRAGMA journal_mode=WAL;
         CREATE TABLE IF NOT EXISTS miner_stats (
             id            INTEGER PRIMARY KEY AUTOINCREMENT,
             collected_at  TEXT    NOT NULL,
@@ -41,4 +102,4 @@ class DB:
         );
         CREATE INDEX IF NOT EXISTS idx_miner_time ON miner_stats(ip, collected_at);
         """
-        self.conn.executescript(ddl)
+        self._conn().executescript(ddl)
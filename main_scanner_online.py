@@ -1,6 +1,7 @@
 # scanner.py
 
 import argparse
+import logging
 import os
 import time
 import traceback
@@ -14,7 +15,7 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-SCAN_INTERVAL = int(os.getenv("SCAN_INTERVAL", "30"))
+SCAN_INTERVAL = float(os.getenv("SCAN_INTERVAL", "30"))
 MAX_WORKERS = 32
 
 
@@ -31,6 +32,7 @@ def parse_args():
 
 def main() -> None:
     args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
     subnet = args.subnet or os.getenv("SUBNET", "192.168.0.*")
 
     # ─── Configure sinks ────────────────────────────────────────────────
@@ -44,14 +46,15 @@ def main() -> None:
             timeout=int(os.getenv("API_TIMEOUT", "10")),
         )
 
-    collector = Collector(db=db, rest_client=rest)
+    collector = Collector(db=db, rest_client=rest, max_workers=MAX_WORKERS)
     network = LocalMiners()
 
+    # Cycles start on a fixed monotonic grid so their start times don't drift
+    next_tick = time.monotonic()
     while True:
-        cycle_start = time.perf_counter()
         try:
-            miners = network.discover(subnet)
-            print(f"[Scanner] subnet {subnet} → {len(miners)} device(s) online")
+            miners = network.discover(subnet, resolve_versions=False)
+            logging.info("[Scanner] subnet %s → %d device(s) online", subnet, len(miners))
 
             if miners:
                 # Optional: parallelize stats fetching here, but collect_all calls stats() internally
@@ -60,8 +63,13 @@ def main() -> None:
         except Exception:
             traceback.print_exc()
 
-        time_spent = time.perf_counter() - cycle_start
-        time.sleep(max(0, SCAN_INTERVAL - time_spent))
+        next_tick += SCAN_INTERVAL
+        delay = next_tick - time.monotonic()
+        if delay < 0:
+            logging.warning("[Scanner] cycle overran SCAN_INTERVAL by %.2fs", -delay)
+            next_tick = time.monotonic()  # start the next cycle now and re-align
+        else:
+            time.sleep(delay)
 
 
 if __name__ == "__main__":
@@ -1,9 +1,19 @@
 # netutils.py
-import platform, re, subprocess
-from typing import Optional
+import platform, re, subprocess, time
+from typing import Dict, Optional, Tuple
 from getmac import get_mac_address
 
+# Seconds a parsed ARP table is reused by arp_table() / mac_via_arp_table()
+ARP_TTL = 30.0
+_ARP_CACHE: Tuple[float, Optional[Dict[str, str]]] = (0.0, None)
+
+_WIN_ARP_RE = re.compile(r"(\d{1,3}(?:\.\d{1,3}){3})\s+((?:[0-9A-Fa-f]{2}-){5}[0-9A-Fa-f]{2})")
+
 def mac_via_arp_table(ip: str) -> Optional[str]:
+    table = arp_table()
+    if table is not None and ip in table:
+        return table[ip]
+    # Last resort: ask the arp tool about this one host
     try:
         if platform.system() == "Windows":
             out = subprocess.check_output(["arp", "-a", ip], text=True, stderr=subprocess.DEVNULL)
@@ -14,6 +24,47 @@ def mac_via_arp_table(ip: str) -> Optional[str]:
     except Exception:
         return None
 
+def arp_table(max_age: float = ARP_TTL) -> Optional[Dict[str, str]]:
+    """
+    ARP cache as {ip: mac}, re-read at most every `max_age` seconds
+    (pass 0 to force a fresh read). Incomplete entries are skipped.
+    Returns None where no table can be read.
+    """
+    global _ARP_CACHE
+    read_at, table = _ARP_CACHE
+    now = time.monotonic()
+    if table is None or now - read_at >= max_age:
+        table = _read_arp_table()
+        _ARP_CACHE = (now, table)
+    return table
+
+def _read_arp_table() -> Optional[Dict[str, str]]:
+    if platform.system() == "Windows":
+        return _read_arp_table_windows()
+    return _read_arp_table_linux()
+
+def _read_arp_table_linux() -> Optional[Dict[str, str]]:
+    # One read of the kernel table; None where /proc/net/arp is missing
+    try:
+        with open("/proc/net/arp") as f:
+            next(f)  # header
+            table = {}
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 4 and parts[3] != "00:00:00:00:00:00":
+                    table[parts[0]] = parts[3].lower()
+            return table
+    except OSError:
+        return None
+
+def _read_arp_table_windows() -> Optional[Dict[str, str]]:
+    # One `arp -a` for every interface instead of one per host
+    try:
+        out = subprocess.check_output(["arp", "-a"], text=True, stderr=subprocess.DEVNULL)
+    except Exception:
+        return None
+    return {ip: mac.lower().replace("-", ":") for ip, mac in _WIN_ARP_RE.findall(out)}
+
 def mac_via_scapy(ip: str, timeout: float = 1.0) -> Optional[str]:
     try:
         # Requires: pip install scapy ; and root/admin or CAP_NET_RAW on Linux
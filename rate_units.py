@@ -1,5 +1,6 @@
 # units.py
 import re
+from functools import lru_cache
 from typing import Tuple, Optional
 
 # Keep keys lowercase and minimal (family+number)
@@ -18,8 +19,16 @@ UNIT_MAP = {
     "s9se":"TH/s",
 }
 
+# Multiplier from GH/s to each display unit
+_UNIT_FACTORS = {
+    "TH/s": 1e-3,
+    "GH/s": 1.0,
+    "MH/s": 1e3,
+}
+
 _MODEL_KEY_RE = re.compile(r"([a-z])\s*-?\s*(\d+)", re.I)
 
+@lru_cache(maxsize=256)
 def model_key(model: Optional[str]) -> Optional[str]:
     """
     Normalize a model string ('Antminer L9', 'L9', 'S19j Pro', 's19j-pro') -> 'l9'/'s19'
@@ -32,25 +41,38 @@ def model_key(model: Optional[str]) -> Optional[str]:
     fam, num = m.groups()
     return f"{fam.lower()}{num}"
 
+@lru_cache(maxsize=256)
 def preferred_unit_for_model(model: Optional[str]) -> str:
     key = model_key(model)
     return UNIT_MAP.get(key or "", "GH/s")  # default to GH/s if unknown
 
+@lru_cache(maxsize=256)
+def unit_and_factor(model: Optional[str]) -> Tuple[str, float]:
+    """
+    (unit_str, factor) for a model, so callers formatting several rates for the
+    same miner resolve the unit once: value_in_unit = value_ghs * factor.
+    """
+    unit = preferred_unit_for_model(model)
+    if unit not in _UNIT_FACTORS:
+        return "GH/s", 1.0  # fallback: unknown unit, keep GH/s
+    return unit, _UNIT_FACTORS[unit]
+
 def convert_from_ghs(value_ghs: Optional[float], model: Optional[str]) -> Tuple[Optional[float], str]:
     """
     Input is GH/s (what many stats fields use). Output is (value_in_preferred_unit, unit_str).
     """
-    if model_key(model) == "l7" and value_ghs >1000:
+    unit, factor = unit_and_factor(model)
+    if value_ghs is None:
+        return None, unit
+
+    if value_ghs > 1000 and model_key(model) == "l7":
         value_ghs = value_ghs / 1000.0  # L7 is usually in TH/s
+    return value_ghs * factor, unit
 
-    if value_ghs is None:
-        return None, preferred_unit_for_model(model)
-    unit = preferred_unit_for_model(model)
-    if unit == "TH/s":
-        return value_ghs / 1000.0, unit
-    if unit == "GH/s":
-        return value_ghs, unit
-    if unit == "MH/s":
-        return value_ghs * 1000.0, unit
-    # fallback: unknown unit, keep GH/s
-    return value_ghs, "GH/s"
+def format_rate(value_ghs: float, model: Optional[str]) -> str:
+    """
+    GH/s rate as display text in the model's unit, e.g. '95.01 TH/s'. The
+    unit lookups behind convert_from_ghs are cached, so this is cheap per call.
+    """
+    val, unit = convert_from_ghs(value_ghs, model)
+    return f"{val:.2f} {unit}"
@@ -1,14 +1,28 @@
 # rest_client.py
 from __future__ import annotations
 
+import gzip
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Optional
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import json
-from datetime import datetime
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; stdlib json is used otherwise
+    orjson = None
+
+if orjson is not None:
+    def _dumps(obj: Any) -> bytes:
+        # Non-str keys (e.g. int card ids) are stringified like json.dumps does
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+else:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
 
 
 class RestClient:
@@ -18,6 +32,7 @@ class RestClient:
       • Optional Basic/Bearer auth (header already set by caller)
       • Retries (502/503/504)
       • Batch sending for payloads that include {"results": [...]}
+      • Pooled keep-alive connections, optional parallel batches and gzip bodies
     """
 
     def __init__(
@@ -28,10 +43,14 @@ class RestClient:
         retries: int = 0,
         backoff: float = 0.3,
         batch_size: int = 1,          # NEW: how many items per POST
+        parallel_batches: int = 1,    # batches in flight at once for post()
+        compress: bool = False,       # gzip request bodies (server must accept Content-Encoding: gzip)
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.batch_size = max(1, int(batch_size))
+        self.parallel_batches = max(1, int(parallel_batches))
+        self.compress = compress
 
         self.session = requests.Session()
         self.session.headers.update({"Content-Type": "application/json"})
@@ -41,15 +60,26 @@ class RestClient:
             # set `self.session.auth = (user, pass_)` in __init__ instead.
             self.session.headers.update({"Authorization": f"Basic {api_key}"})
 
-        # retry_cfg = Retry(
-        #     total=retries,
-        #     backoff_factor=backoff,
-        #     status_forcelist=[502, 503, 504],
-        #     allowed_methods=["POST"],
-        # )
-        # adapter = HTTPAdapter(max_retries=retry_cfg)
-        # self.session.mount("http://", adapter)
-        # self.session.mount("https://", adapter)
+        # One adapter for both schemes; keep enough pooled keep-alive
+        # connections for every parallel batch so none pays a new handshake.
+        pool_size = max(32, self.parallel_batches)
+        retry_cfg = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=["POST"],
+            # A read timeout may come after the server took the body; replaying
+            # the push would store it twice, so only connect/status errors retry.
+            read=0,
+            raise_on_status=False,  # let raise_for_status() report the last reply
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry_cfg,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     # ------------------------------------------------------------------ #
     # Public API
@@ -70,27 +100,38 @@ class RestClient:
         if len(results) == 0:
             return  # nothing to send
 
-        # Batch the list
+        if self.parallel_batches > 1 and len(results) > self.batch_size:
+            chunks = [results[i : i + self.batch_size] for i in range(0, len(results), self.batch_size)]
+            with ThreadPoolExecutor(max_workers=self.parallel_batches) as ex:
+                ok = sum(ex.map(lambda c: self._post_once(url, {**payload, "results": c}), chunks))
+            logging.info("[RestClient] POST %s - %d/%d batches sent (%d items)", url, ok, len(chunks), len(results))
+            return
+
+        # Batch the list. _post_once serialises the body before returning, so
+        # one copy of the outer dict is re-pointed at each chunk in turn.
+        batched_payload = dict(payload)
         for i in range(0, len(results), self.batch_size):
-            chunk = results[i : i + self.batch_size]
-            batched_payload = dict(payload)
-            batched_payload["results"] = chunk
+            batched_payload["results"] = results[i : i + self.batch_size]
             self._post_once(url, batched_payload)
-            # print status until done
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            print(f"[{now}] [RestClient] POST {url} - sent {min(i + self.batch_size, len(results))}/{len(results)} items")
+            logging.info("[RestClient] POST %s - sent %d/%d items", url, min(i + self.batch_size, len(results)), len(results))
 
     # ------------------------------------------------------------------ #
     # Internal helper
     # ------------------------------------------------------------------ #
-    def _post_once(self, url: str, body: Dict[str, Any]) -> None:
-        # print body ip for logging
-
+    def _post_once(self, url: str, body: Dict[str, Any]) -> bool:
+        """POST one body; failures are logged, not raised. True on success."""
         try:
-            # payloadStr = json.dumps(body,indent=2)
-            # print(f'payloadStr: {payloadStr}')
-            r = self.session.post(url, json=body, timeout=self.timeout)
+            # Content-Type: application/json is a session header
+            data = _dumps(body)
+            if self.compress:
+                r = self.session.post(
+                    url, data=gzip.compress(data), timeout=self.timeout,
+                    headers={"Content-Encoding": "gzip"},
+                )
+            else:
+                r = self.session.post(url, data=data, timeout=self.timeout)
             r.raise_for_status()
+            return True
         except requests.HTTPError as exc:
             logging.warning(
                 "REST push failed for ip=%s → %s – %s",
@@ -98,6 +139,7 @@ class RestClient:
                 url,
                 exc,
             )
+            return False
         except Exception as exc:
             logging.warning(
                 "REST push error for ip=%s → %s – %s",
@@ -105,29 +147,23 @@ class RestClient:
                 url,
                 exc,
             )
+            return False
+
     def post_device_online(self, path: str, payload: Dict[str, Any]) -> None:
         # ex. req body: {"results": [{"ip":"192.168.x.y","online": "true""]}]}"
         url = f"{self.base_url}/{path.lstrip('/')}" if path else self.base_url
 
-        new_payload = {"results": [{"ip": item.get("ip"), "online": item.get("online")} for item in payload["results"] if isinstance(item, dict)]}
-
-        # Batch the list
-        results = new_payload.get("results") if isinstance(new_payload, dict) else None
-        if not isinstance(results, list):
-            self._post_once(url, new_payload)
-            return
-
+        results = [{"ip": item.get("ip"), "online": item.get("online")} for item in payload["results"] if isinstance(item, dict)]
         if len(results) == 0:
             return  # nothing to send
+
+        # Batch the list
         for i in range(0, len(results), self.batch_size):
-            chunk = results[i : i + self.batch_size]
-            batched_payload = dict(new_payload)
-            batched_payload["results"] = chunk
-            print(json.dumps(batched_payload) )
+            batched_payload = {"results": results[i : i + self.batch_size]}
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug("[RestClient] device online batch: %s", batched_payload)
             self._post_once(url, batched_payload)
-            # print status until done
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            print(f"[{now}] [RestClient] POST Device Online {url} - sent {min(i + self.batch_size, len(results))}/{len(results)} items")
+            logging.info("[RestClient] POST Device Online %s - sent %d/%d items", url, min(i + self.batch_size, len(results)), len(results))
 
 def _safe_ip(body: Dict[str, Any]) -> str:
     # Try to pull an IP field for logging (supports both single record and results[])
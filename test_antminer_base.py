@@ -0,0 +1,84 @@
+import socket
+
+from antminer.base import BaseClient
+
+OK = b'{"STATUS":[{"STATUS":"S"}]}\x00'
+
+
+class FakeSocket:
+    """Scripted stand-in for a miner connection."""
+
+    def __init__(self, replies=(), send_error=None):
+        self.replies = list(replies)  # bytes chunks, or exceptions to raise
+        self.send_error = send_error
+        self.sent = []
+        self.closed = False
+
+    def setsockopt(self, *args):
+        pass
+
+    def settimeout(self, timeout):
+        pass
+
+    def sendall(self, data):
+        if self.send_error is not None:
+            raise self.send_error
+        self.sent.append(data)
+
+    def recv_into(self, view):
+        item = self.replies.pop(0) if self.replies else b""
+        if isinstance(item, BaseException):
+            raise item
+        view[:len(item)] = item
+        return len(item)
+
+    def close(self):
+        self.closed = True
+
+
+def _client(kept: FakeSocket, *fresh: FakeSocket) -> BaseClient:
+    """Client holding a kept-alive socket; connect() hands out `fresh` in order."""
+    cli = BaseClient("10.0.0.1")
+    pending = list(fresh)
+    cli.connect = lambda: cli.attach(pending.pop(0))
+    cli.attach(kept)
+    return cli
+
+
+def test_eof_before_reply_on_reused_socket_resends_once():
+    kept, fresh = FakeSocket(replies=[b""]), FakeSocket(replies=[OK])
+    cli = _client(kept, fresh)
+
+    assert cli.send_command("summary") == {"STATUS": [{"STATUS": "S"}]}
+    assert len(kept.sent) == 1 and kept.closed
+    assert len(fresh.sent) == 1
+
+
+def test_timeout_never_resends():
+    kept, fresh = FakeSocket(replies=[socket.timeout()]), FakeSocket(replies=[OK])
+    cli = _client(kept, fresh)
+
+    assert cli.send_command("restart") == ""
+    assert len(kept.sent) == 1 and kept.closed
+    assert fresh.sent == []
+    assert cli.conn is None
+
+
+def test_partial_reply_then_timeout_never_resends():
+    kept = FakeSocket(replies=[b'{"STATUS":[{"STA', socket.timeout()])
+    fresh = FakeSocket(replies=[OK])
+    cli = _client(kept, fresh)
+
+    assert cli.send_command("addpool|url,user,pass") == '{"STATUS":[{"STA'
+    assert fresh.sent == []
+    assert cli.conn is None  # the rest of the reply cannot leak into the next command
+
+
+def test_reset_during_sendall_resends():
+    kept = FakeSocket(send_error=ConnectionResetError())
+    fresh = FakeSocket(replies=[OK])
+    cli = _client(kept, fresh)
+
+    assert cli.send_command("summary") == {"STATUS": [{"STATUS": "S"}]}
+    assert kept.sent == [] and kept.closed
+    assert len(fresh.sent) == 1
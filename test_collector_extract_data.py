@@ -0,0 +1,107 @@
+from collector import Collector
+
+# Trimmed bmminer `stats` reply: STATS[0] is the version block, STATS[1] the data
+S19_STATS = {
+    "STATUS": [{"STATUS": "S", "Msg": "CGMiner stats"}],
+    "STATS": [
+        {"BMMiner": "2.0.0", "Miner": "uart_trans.1.3", "Type": "Antminer S19"},
+        {
+            "GHS av": "95012.34",
+            "miner_count": 3,
+            "frequency": "650",
+            "fan_num": 4,
+            "fan1": 5040,
+            "fan2": "5160",
+            "fan3": 5100,
+            "fan4": 5220,
+            "temp_max": 72,
+            "total_rateideal": "95000.00",
+            "temp2_1": 70,
+            "temp2_2": "71",
+            "temp2_3": 72,
+            "temp_in_chip_1": "55-56-57-58",
+            "temp_out_chip_1": "68-69-70-71",
+            "chain_rate1": "31500.10",
+            "chain_rate2": "31700.20",
+            "chain_rate3": "31800.30",
+            "chain_rateideal1": "31666.00",
+            "chain_acn1": 76,
+            "chain_acn2": 76,
+            "chain_acn3": 76,
+            "chain_hw1": 10,
+            "chain_hw2": "20",
+            "chain_hw3": 30,
+            "chain_avg_hashrate1": "31.50",
+            "chain_avg_hashrate2": "31.70",
+            "chain_avg_hashrate3": "31.80",
+        },
+    ],
+}
+
+
+def _extract(summary):
+    return Collector._extract_data("192.168.1.10", {"STATS": [{}, summary]}, None, [])
+
+
+def test_extract_data_s19_payload():
+    r = Collector._extract_data(
+        "192.168.1.10",
+        S19_STATS,
+        {"model": "Antminer S19"},
+        [{"url": "stratum+tcp://pool:3333", "workername": "farm.s19"}],
+    )
+    assert r.model == "Antminer S19"
+    assert r.hashrate_avg == 95012.34
+    assert r.temperature == 72.0
+    assert r.temp_max == 72
+    assert r.worker_name == "farm.s19"
+    assert r.pool == "stratum+tcp://pool:3333"
+    assert r.miner_count == 3
+    assert r.frequency == 650
+    assert r.total_rate_ideal == 95000.0
+    assert r.fan_num == 4
+    assert r.fans == [5040, 5160, 5100, 5220]
+    assert r.chain_hw == [10, 20, 30]
+    assert r.chain_avg_hashrate == ["31.50", "31.70", "31.80"]
+    assert r.card == {
+        # chain_rateideal1 must not overwrite chain 1's hashrate
+        "1": {"temp": 70, "temp_in": "55-56-57-58", "temp_out": "68-69-70-71",
+              "hashrate": 31500.1, "chain_acn": 76},
+        "2": {"temp": 71, "temp_in": None, "temp_out": None,
+              "hashrate": 31700.2, "chain_acn": 76},
+        "3": {"temp": 72, "temp_in": None, "temp_out": None,
+              "hashrate": 31800.3, "chain_acn": 76},
+    }
+
+
+def test_extract_data_fans_stay_within_1_to_fan_num():
+    r = _extract({"fan_num": 2, "fan0": 1, "fan1": 3000, "fan2": 3100, "fan3": 3200})
+    assert r.fans == [3000, 3100]
+
+
+def test_extract_data_chain_series_stop_at_first_gap():
+    r = _extract({
+        "chain_hw1": 1, "chain_hw2": 2, "chain_hw3": 3, "chain_hw5": 5,
+        "chain_avg_hashrate1": "1.0", "chain_avg_hashrate2": "2.0", "chain_avg_hashrate4": "4.0",
+    })
+    assert r.chain_hw == [1, 2, 3]
+    assert r.chain_avg_hashrate == ["1.0", "2.0"]
+
+
+def test_extract_data_upper_case_chain_avg_hashrate():
+    r = _extract({
+        "CHAIN AVG HASHRATE1": 10.5,
+        "CHAIN AVG HASHRATE2": 11.5,
+        "chain_avg_hashrate2": "12.5",  # lower-case spelling wins per chain
+    })
+    assert r.chain_avg_hashrate == ["10.5", "12.5"]
+
+
+def test_extract_data_without_stats():
+    r = Collector._extract_data("192.168.1.10", {}, None, [])
+    assert r.ip == "192.168.1.10"
+    assert r.fan_num == 0
+    assert r.fans is None
+    assert r.card is None
+    assert r.chain_hw is None
+    assert r.chain_avg_hashrate is None
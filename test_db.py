@@ -0,0 +1,67 @@
+import datetime
+import sqlite3
+
+from collector import CollectorData
+from db import DB
+
+COLUMNS = [
+    "id", "collected_at", "ip", "model", "hashrate_5s", "hashrate_avg",
+    "temperature", "worker_name", "pool", "owner_name", "is_online",
+]
+
+
+def _rows(path):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = conn.execute("SELECT * FROM miner_stats ORDER BY id").fetchall()
+        return [dict(r) for r in rows]
+    finally:
+        conn.close()
+
+
+def test_insert_writes_aliased_fields_to_their_columns(tmp_path):
+    path = str(tmp_path / "miners.db")
+    db = DB(path)
+    # model/hashrate_avg/is_online serialise as brand/hashrate/online by
+    # alias; the DB must store them under the field names
+    db.insert(CollectorData(
+        collected_at=datetime.datetime(2024, 1, 2, 3, 4, 5),
+        ip="192.168.1.10",
+        model="Antminer S19",
+        hashrate_avg=95012.5,
+        temperature=72.0,
+        worker_name="farm.s19",
+        pool="stratum+tcp://pool:3333",
+        is_online=True,
+    ))
+
+    [row] = _rows(path)
+    assert list(row) == COLUMNS
+    assert row["collected_at"] == "2024-01-02 03:04:05"
+    assert row["ip"] == "192.168.1.10"
+    assert row["model"] == "Antminer S19"
+    assert row["hashrate_avg"] == 95012.5
+    assert row["temperature"] == 72.0
+    assert row["worker_name"] == "farm.s19"
+    assert row["pool"] == "stratum+tcp://pool:3333"
+    assert row["hashrate_5s"] is None
+    assert row["owner_name"] is None
+    assert row["is_online"] == 1
+
+
+def test_insert_many_stores_every_record(tmp_path):
+    path = str(tmp_path / "miners.db")
+    db = DB(path)
+    db.insert_many([
+        # the collector builds records with model_construct
+        CollectorData.model_construct(ip="10.0.0.1", model="Antminer L7", hashrate_avg=9500.0),
+        CollectorData(ip="10.0.0.2", is_online=False),
+    ])
+
+    rows = _rows(path)
+    assert [(r["ip"], r["model"], r["hashrate_avg"], r["is_online"]) for r in rows] == [
+        ("10.0.0.1", "Antminer L7", 9500.0, 1),
+        ("10.0.0.2", None, None, 0),
+    ]
+    assert all(r["collected_at"] for r in rows)